@@ -18,21 +18,392 @@ import collections
 import csv
 import datetime
 import decimal
+import io
+import itertools
+import os
 import re
+import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
 import config
 import log_config
 import misc
 import transaction as tr
 from core import kraken_asset_map
-from database import set_price_db
+from database import set_price_db, set_prices_db
 from price_data import PriceData
 
 log = log_config.getLogger(__name__)
 
+# Operation types of a simple trade, which consists of exactly one buy and
+# one sell operation at the same time.
+BUY_SELL_PAIR = collections.Counter({tr.Buy.type_name_c(): 1, tr.Sell.type_name_c(): 1})
+
+# Account statements are read as a whole. Read them in large chunks to reduce
+# the number of read calls on large files.
+READ_BUFFER_SIZE = 1 << 20
+
+# Operation classes by their name, e.g. "Buy" -> tr.Buy.
+OPERATION_CLASSES: dict[str, type[tr.Operation]] = {
+    name: cls
+    for name, cls in vars(tr).items()
+    if isinstance(cls, type) and issubclass(cls, tr.Operation)
+}
+
+# Binance operations which map onto a CoinTaxman operation.
+BINANCE_OPERATION_MAPPING: dict[str, str] = {
+    "Distribution": "Airdrop",
+    "Cash Voucher distribution": "Airdrop",
+    "Cashback Voucher": "Airdrop",
+    "Rewards Distribution": "Airdrop",
+    "Simple Earn Flexible Airdrop": "Airdrop",
+    "Airdrop Assets": "Airdrop",
+    "Crypto Box": "Airdrop",
+    "Launchpool Airdrop": "Airdrop",
+    "Megadrop Rewards": "Airdrop",
+    #
+    "Savings Interest": "CoinLendInterest",
+    "Savings purchase": "CoinLend",
+    "Savings Principal redemption": "CoinLendEnd",
+    "Savings distribution": "CoinLendInterest",
+    "Simple Earn Flexible Subscription": "CoinLend",
+    "Simple Earn Flexible Redemption": "CoinLendEnd",
+    "Simple Earn Flexible Interest": "CoinLendInterest",
+    "Simple Earn Locked Subscription": "CoinLend",
+    "Simple Earn Locked Redemption": "CoinLendEnd",
+    "Simple Earn Locked Rewards": "CoinLendInterest",
+    "Savings Distribution": "CoinLendInterest",
+    #
+    "BNB Vault Rewards": "CoinLendInterest",
+    "Launchpool Earnings Withdrawal": "CoinLendInterest",
+    #
+    "Commission History": "Commission",
+    "Commission Fee Shared With You": "Commission",
+    "Referrer rebates": "Commission",
+    "Referral Kickback": "Commission",
+    "Commission Rebate": "Commission",
+    # DeFi yield farming
+    "Liquid Swap add": "CoinLend",
+    "Liquid Swap remove": "CoinLendEnd",
+    "Liquid Swap rewards": "CoinLendInterest",
+    "Launchpool Interest": "CoinLendInterest",
+    #
+    "Super BNB Mining": "StakingInterest",
+    "POS savings interest": "StakingInterest",
+    "POS savings purchase": "Staking",
+    "POS savings redemption": "StakingEnd",
+    "ETH 2.0 Staking Rewards": "StakingInterest",
+    "Staking Purchase": "Staking",
+    "Staking Rewards": "StakingInterest",
+    "Staking Redemption": "StakingEnd",
+    #
+    "Fiat Deposit": "Deposit",
+    "Fiat Withdraw": "Withdrawal",
+    "Withdraw": "Withdrawal",
+    #
+    "Transaction Buy": "Buy",
+    "Transaction Spend": "Sell",
+    "Transaction Revenue": "Buy",
+    "Transaction Sold": "Sell",
+    "Transaction Fee": "Fee",
+    "Asset Recovery": "Sell",
+}
+
+# Binance operations which are a buy or sell depending on the sign of the
+# change.
+BINANCE_SIGN_OPERATIONS = frozenset(
+    {
+        "The Easiest Way to Trade",
+        "Small assets exchange BNB",
+        "Small Assets Exchange BNB",
+        "Transaction Related",
+        "Large OTC trading",
+        "Sell",
+        "Buy",
+        "Binance Convert",
+    }
+)
+
+# Binance account types which are supported.
+BINANCE_SUPPORTED_ACCOUNT_TYPES = ("Spot", "Savings", "Earn", "Funding")
+
+# Binance default remarks which carry no information.
+BINANCE_DEFAULT_REMARKS = frozenset(
+    {
+        "Withdraw fee is included",
+        "Binance Earn",
+        "Binance Pay",
+        "Binance Launchpool",
+    }
+)
+
+# Coinbase operations which map onto a CoinTaxman operation.
+COINBASE_OPERATION_MAPPING: dict[str, str] = {
+    "Receive": "Deposit",
+    "Send": "Withdrawal",
+    "Coinbase Earn": "Buy",
+    "Learning Reward": "Buy",
+    "Rewards Income": "Staking",
+}
+
+# Remark of Coinbase convert operations, e.g. "Converted 0,123 ETH to 0,456 BTC".
+COINBASE_CONVERT_PATTERN = re.compile(
+    r"Converted [0-9,.]+ [A-Z]+ to (?P<change>[0-9,.]+) (?P<coin>[A-Z]+)"
+)
+
+# Coinbase Pro operations which map onto a CoinTaxman operation.
+COINBASE_PRO_OPERATION_MAPPING: dict[str, str] = {
+    "BUY": "Buy",
+    "SELL": "Sell",
+}
+
+# Kraken ledger types which map onto a CoinTaxman operation.
+KRAKEN_OPERATION_MAPPING: dict[str, str] = {
+    "spend": "Sell",  # Sell ordered via 'Buy Crypto' button
+    "receive": "Buy",  # Buy ordered via 'Buy Crypto' button
+    "reward": "StakingInterest",
+    "staking": "StakingInterest",
+    "deposit": "Deposit",
+    "withdrawal": "Withdrawal",
+}
+
+# Kraken ledger types of margin trading, which is not supported.
+KRAKEN_MARGIN_TYPES = frozenset({"margin trade", "rollover", "settled", "margin"})
+
+# Bitpanda transaction types which map onto a CoinTaxman operation.
+BITPANDA_OPERATION_MAPPING: dict[str, str] = {
+    "deposit": "Deposit",
+    "withdrawal": "Withdrawal",
+    "buy": "Buy",
+    "sell": "Sell",
+}
+
+# Row in which the header of an account statement is expected at the latest.
+EXPECTED_HEADER_ROW: dict[str, int] = {
+    "binance": 1,
+    "binance_v2": 1,
+    "coinbase": 1,
+    "coinbase_v2": 1,
+    "coinbase_v3": 1,
+    "coinbase_v4": 4,
+    "coinbase_pro": 1,
+    "kraken_ledgers_old": 1,
+    "kraken_ledgers": 1,
+    "kraken_trades": 1,
+    "bitpanda_pro_trades": 4,
+    "bitpanda": 7,
+    "custom_eur": 1,
+}
+
+# Header of the account statements by exchange.
+EXPECTED_HEADERS: dict[str, tuple[str, ...]] = {
+    "binance": (
+        "UTC_Time",
+        "Account",
+        "Operation",
+        "Coin",
+        "Change",
+        "Remark",
+    ),
+    "binance_v2": (
+        "User_ID",
+        "UTC_Time",
+        "Account",
+        "Operation",
+        "Coin",
+        "Change",
+        "Remark",
+    ),
+    "coinbase": (
+        "You can use this transaction report to inform your "
+        "likely tax obligations. For US customers, Sells, "
+        "Converts, and Rewards Income, and Coinbase Earn "
+        "transactions are taxable events. For final tax "
+        "obligations, please consult your tax advisor.",
+    ),
+    "coinbase_v2": (
+        "You can use this transaction report to inform your "
+        "likely tax obligations. For US customers, Sells, "
+        "Converts, Rewards Income, Coinbase Earn "
+        "transactions, and Donations are taxable events. "
+        "For final tax obligations, please consult your tax advisor.",
+    ),
+    "coinbase_v3": (
+        "You can use this transaction report to inform your "
+        "likely tax obligations. For US customers, Sells, "
+        "Converts, Rewards Income, Learning Rewards, "
+        "and Donations are taxable events. "
+        "For final tax obligations, please consult your tax advisor.",
+    ),
+    "coinbase_v4": (
+        "ID",
+        "Timestamp",
+        "Transaction Type",
+        "Asset",
+        "Quantity Transacted",
+        "Price Currency",
+        "Price at Transaction",
+        "Subtotal",
+        "Total (inclusive of fees and/or spread)",
+        "Fees and/or Spread",
+        "Notes",
+    ),
+    "coinbase_pro": (
+        "portfolio",
+        "trade id",
+        "product",
+        "side",
+        "created at",
+        "size",
+        "size unit",
+        "price",
+        "fee",
+        "total",
+        "price/fee/total unit",
+    ),
+    "kraken_ledgers_old": (
+        "txid",
+        "refid",
+        "time",
+        "type",
+        "aclass",
+        "asset",
+        "amount",
+        "fee",
+        "balance",
+    ),
+    "kraken_ledgers": (
+        "txid",
+        "refid",
+        "time",
+        "type",
+        "subtype",
+        "aclass",
+        "asset",
+        "amount",
+        "fee",
+        "balance",
+    ),
+    "kraken_trades": (
+        "txid",
+        "ordertxid",
+        "pair",
+        "time",
+        "type",
+        "ordertype",
+        "price",
+        "cost",
+        "fee",
+        "vol",
+        "margin",
+        "misc",
+        "ledgers",
+    ),
+    "bitpanda_pro_trades": (
+        "Order ID",
+        "Trade ID",
+        "Type",
+        "Market",
+        "Amount",
+        "Amount Currency",
+        "Price",
+        "Price Currency",
+        "Fee",
+        "Fee Currency",
+        "Time (UTC)",
+    ),
+    "bitpanda": (
+        "Transaction ID",
+        "Timestamp",
+        "Transaction Type",
+        "In/Out",
+        "Amount Fiat",
+        "Fiat",
+        "Amount Asset",
+        "Asset",
+        "Asset market price",
+        "Asset market price currency",
+        "Asset class",
+        "Product ID",
+        "Fee",
+        "Fee asset",
+        "Spread",
+        "Spread Currency",
+    ),
+    "custom_eur": (
+        "Type",
+        "Buy Quantity",
+        "Buy Asset",
+        "Buy Value in EUR",
+        "Sell Quantity",
+        "Sell Asset",
+        "Sell Value in EUR",
+        "Fee Quantity",
+        "Fee Asset",
+        "Fee Value in EUR",
+        "Wallet",
+        "Timestamp UTC",
+        "Note",
+    ),
+}
+
+# Column headers of the Coinbase transaction exports by number of columns.
+COINBASE_FIELDS: dict[int, tuple[tuple[str, ...], ...]] = {
+    # Coinbase export format from 2023/2024 and ongoing
+    11: (EXPECTED_HEADERS["coinbase_v4"],),
+    # Coinbase export format from late 2021 until 2023/2024
+    10: (
+        (
+            "Timestamp",
+            "Transaction Type",
+            "Asset",
+            "Quantity Transacted",
+            "Spot Price Currency",
+            "Spot Price at Transaction",
+            "Subtotal",
+            "Total (inclusive of fees)",
+            "Fees",
+            "Notes",
+        ),
+        (
+            "Timestamp",
+            "Transaction Type",
+            "Asset",
+            "Quantity Transacted",
+            "Spot Price Currency",
+            "Spot Price at Transaction",
+            "Subtotal",
+            "Total (inclusive of fees and/or spread)",
+            "Fees and/or Spread",
+            "Notes",
+        ),
+    ),
+    # Coinbase export format from mid 2021 and before
+    9: (
+        (
+            "Timestamp",
+            "Transaction Type",
+            "Asset",
+            "Quantity Transacted",
+            "EUR Spot Price at Transaction",
+            "EUR Subtotal",
+            "EUR Total (inclusive of fees)",
+            "EUR Fees",
+            "Notes",
+        ),
+    ),
+}
+
+# Number of characters at the beginning of a file, in which the header of an
+# account statement is searched.
+DETECT_EXCHANGE_WINDOW = 1 << 16
+
+# Look up the exchange by header instead of comparing every header.
+HEADER_EXCHANGES = {header: exchange for exchange, header in EXPECTED_HEADERS.items()}
+MAX_HEADER_ROW = max(EXPECTED_HEADER_ROW.values())
+
 
 class Book:
     # Need to track state of duplicate deposit/withdrawal entries
@@ -47,6 +418,13 @@ class Book:
 
         self.operations: list[tr.Operation] = []
 
+        # Reading functions by exchange, e.g. "binance" -> self._read_binance.
+        self.readers: dict[str, Callable[[Path], None]] = {
+            name.removeprefix("_read_"): getattr(self, name)
+            for name in dir(self)
+            if name.startswith("_read_")
+        }
+
     def __bool__(self) -> bool:
         return bool(self.operations)
 
@@ -63,8 +441,8 @@ class Book:
     ) -> tr.Operation:
 
         try:
-            Op = getattr(tr, operation)
-        except AttributeError:
+            Op = OPERATION_CLASSES[operation]
+        except KeyError:
             log.error(
                 f"Could not recognize {operation=} from {platform=} in "
                 f"{file_path=} {row=}. "
@@ -73,10 +451,15 @@ class Book:
             )
             raise RuntimeError
 
-        kwargs = {}
+        kwargs: dict[str, Any] = {}
         if remark:
             kwargs["remarks"] = [remark]
 
+        # Coin and platform names repeat in every row. Intern them to share a
+        # single string object for all operations.
+        platform = sys.intern(platform)
+        coin = sys.intern(coin)
+
         op = Op(utc_time, platform, change, coin, [row], file_path, **kwargs)
         assert isinstance(op, tr.Operation)
         return op
@@ -115,78 +498,28 @@ class Book:
                 remark=remark,
             )
 
-            self._append_operation(op)
+            # The operation has already been filtered above.
+            self.operations.append(op)
 
     def _read_binance(self, file_path: Path, version: int = 1) -> None:
         platform = "binance"
-        operation_mapping = {
-            "Distribution": "Airdrop",
-            "Cash Voucher distribution": "Airdrop",
-            "Cashback Voucher": "Airdrop",
-            "Rewards Distribution": "Airdrop",
-            "Simple Earn Flexible Airdrop": "Airdrop",
-            "Airdrop Assets": "Airdrop",
-            "Crypto Box": "Airdrop",
-            "Launchpool Airdrop": "Airdrop",
-            "Megadrop Rewards": "Airdrop",
-            #
-            "Savings Interest": "CoinLendInterest",
-            "Savings purchase": "CoinLend",
-            "Savings Principal redemption": "CoinLendEnd",
-            "Savings distribution": "CoinLendInterest",
-            "Simple Earn Flexible Subscription": "CoinLend",
-            "Simple Earn Flexible Redemption": "CoinLendEnd",
-            "Simple Earn Flexible Interest": "CoinLendInterest",
-            "Simple Earn Locked Subscription": "CoinLend",
-            "Simple Earn Locked Redemption": "CoinLendEnd",
-            "Simple Earn Locked Rewards": "CoinLendInterest",
-            "Savings Distribution": "CoinLendInterest",
-            #
-            "BNB Vault Rewards": "CoinLendInterest",
-            "Launchpool Earnings Withdrawal": "CoinLendInterest",
-            #
-            "Commission History": "Commission",
-            "Commission Fee Shared With You": "Commission",
-            "Referrer rebates": "Commission",
-            "Referral Kickback": "Commission",
-            "Commission Rebate": "Commission",
-            # DeFi yield farming
-            "Liquid Swap add": "CoinLend",
-            "Liquid Swap remove": "CoinLendEnd",
-            "Liquid Swap rewards": "CoinLendInterest",
-            "Launchpool Interest": "CoinLendInterest",
-            #
-            "Super BNB Mining": "StakingInterest",
-            "POS savings interest": "StakingInterest",
-            "POS savings purchase": "Staking",
-            "POS savings redemption": "StakingEnd",
-            "ETH 2.0 Staking Rewards": "StakingInterest",
-            "Staking Purchase": "Staking",
-            "Staking Rewards": "StakingInterest",
-            "Staking Redemption": "StakingEnd",
-            #
-            "Fiat Deposit": "Deposit",
-            "Fiat Withdraw": "Withdrawal",
-            "Withdraw": "Withdrawal",
-            #
-            "Transaction Buy": "Buy",
-            "Transaction Spend": "Sell",
-            "Transaction Revenue": "Buy",
-            "Transaction Sold": "Sell",
-            "Transaction Fee": "Fee",
-            "Asset Recovery": "Sell",
-        }
 
-        with open(file_path, encoding="utf8") as f:
+        if version not in (1, 2):
+            log.error("File version not Supported " + str(file_path))
+            raise NotImplementedError
+
+        with open(
+            file_path, encoding="utf8", newline="", buffering=READ_BUFFER_SIZE
+        ) as f:
             reader = csv.reader(f)
 
             # Skip header.
             next(reader)
 
-            for rowlist in reader:
+            for row, rowlist in enumerate(reader, start=2):
                 if version == 1:
                     _utc_time, account, operation, coin, _change, remark = rowlist
-                elif version == 2:
+                else:
                     (
                         _,
                         _utc_time,
@@ -196,37 +529,6 @@ class Book:
                         _change,
                         remark,
                     ) = rowlist
-                else:
-                    log.error("File version not Supported " + str(file_path))
-                    raise NotImplementedError
-
-                row = reader.line_num
-
-                # Parse data.
-                utc_time = datetime.datetime.strptime(_utc_time, "%Y-%m-%d %H:%M:%S")
-                utc_time = utc_time.replace(tzinfo=datetime.timezone.utc)
-                change = misc.force_decimal(_change)
-                operation = operation_mapping.get(operation, operation)
-                if operation in (
-                    "The Easiest Way to Trade",
-                    "Small assets exchange BNB",
-                    "Small Assets Exchange BNB",
-                    "Transaction Related",
-                    "Large OTC trading",
-                    "Sell",
-                    "Buy",
-                    "Binance Convert",
-                ):
-                    operation = "Sell" if change < 0 else "Buy"
-
-                if operation == "Liquid Swap add/sell":
-                    operation = "CoinLendEnd" if change < 0 else "CoinLend"
-
-                if operation == "Commission" and account != "Spot":
-                    # All comissions will be handled the same way.
-                    # As of now, only Spot Binance Operations are supported,
-                    # so we have to change the account type to Spot.
-                    account = "Spot"
 
                 if (
                     account in ("Spot", "P2P")
@@ -240,15 +542,31 @@ class Book:
                         and operation == "Transfer Between Main and Funding Wallet"
                     )
                 ):
-                    # Ignore transfers
+                    # Ignore transfers before parsing the row.
                     continue
 
-                change = abs(change)
+                # Parse data.
+                utc_time = misc.parse_utc_timestamp(_utc_time)
+                change = misc.cached_force_decimal(_change)
+                operation = BINANCE_OPERATION_MAPPING.get(operation, operation)
+                if operation in BINANCE_SIGN_OPERATIONS:
+                    operation = "Sell" if change.is_signed() else "Buy"
+
+                if operation == "Liquid Swap add/sell":
+                    operation = "CoinLendEnd" if change.is_signed() else "CoinLend"
+
+                if operation == "Commission" and account != "Spot":
+                    # All comissions will be handled the same way.
+                    # As of now, only Spot Binance Operations are supported,
+                    # so we have to change the account type to Spot.
+                    account = "Spot"
+
+                if change.is_signed():
+                    change = -change
 
                 # Validate data.
-                supported_account_types = ("Spot", "Savings", "Earn", "Funding")
-                assert account in supported_account_types, (
-                    f"Other types than {supported_account_types} are currently "
+                assert account in BINANCE_SUPPORTED_ACCOUNT_TYPES, (
+                    f"Other types than {BINANCE_SUPPORTED_ACCOUNT_TYPES} are currently "
                     f"not supported.  Given account type is `{account}`. "
                     "Please create an Issue or PR."
                 )
@@ -258,12 +576,7 @@ class Book:
 
                 if remark:
                     # Ignore default remarks
-                    if remark in (
-                        "Withdraw fee is included",
-                        "Binance Earn",
-                        "Binance Pay",
-                        "Binance Launchpool",
-                    ) or remark.endswith(" to BNB"):
+                    if remark in BINANCE_DEFAULT_REMARKS or remark.endswith(" to BNB"):
                         remark = ""
 
                     # Do not warn for specific remarks
@@ -289,94 +602,41 @@ class Book:
 
     def _read_coinbase(self, file_path: Path, version: int = 1) -> None:
         platform = "coinbase"
-        operation_mapping = {
-            "Receive": "Deposit",
-            "Send": "Withdrawal",
-            "Coinbase Earn": "Buy",
-            "Learning Reward": "Buy",
-            "Rewards Income": "Staking",
-        }
+        prices: list[tuple[str, str, datetime.datetime, decimal.Decimal]] = []
 
-        with open(file_path, encoding="utf8") as f:
+        with open(
+            file_path, encoding="utf8", newline="", buffering=READ_BUFFER_SIZE
+        ) as f:
             reader = csv.reader(f)
 
             # Skip header.
             try:
+                # Read the preamble at once. Only the content of the disclaimer
+                # and the user row differ between files.
                 if version == 4:
-                    assert next(reader) == []
-                    assert next(reader) == ["Transactions"]
-                    assert next(reader)  # user row
+                    *preamble, user_row = itertools.islice(reader, 3)
+                    assert preamble == [[], ["Transactions"]]
+                    assert user_row
                 else:
-                    assert next(reader)  # header line
-                    assert next(reader) == []
-                    assert next(reader) == []
-                    assert next(reader) == []
-                    assert next(reader) == ["Transactions"]
-                    assert next(reader)  # user row
-                    assert next(reader) == []
-
-                fields = next(reader)
+                    disclaimer, *preamble, user_row, empty_row = itertools.islice(
+                        reader, 7
+                    )
+                    assert disclaimer
+                    assert preamble == [[], [], [], ["Transactions"]]
+                    assert user_row
+                    assert empty_row == []
+
+                fields = tuple(next(reader))
                 num_columns = len(fields)
-                # Coinbase export format from 2023/2024 and ongoing
-                if num_columns == 11:
-                    assert version == 4
-                    assert fields == [
-                        "ID",
-                        "Timestamp",
-                        "Transaction Type",
-                        "Asset",
-                        "Quantity Transacted",
-                        "Price Currency",
-                        "Price at Transaction",
-                        "Subtotal",
-                        "Total (inclusive of fees and/or spread)",
-                        "Fees and/or Spread",
-                        "Notes",
-                    ]
-                # Coinbase export format from late 2021 until 2023/2024
-                elif num_columns == 10:
-                    assert fields == [
-                        "Timestamp",
-                        "Transaction Type",
-                        "Asset",
-                        "Quantity Transacted",
-                        "Spot Price Currency",
-                        "Spot Price at Transaction",
-                        "Subtotal",
-                        "Total (inclusive of fees)",
-                        "Fees",
-                        "Notes",
-                    ] or fields == [
-                        "Timestamp",
-                        "Transaction Type",
-                        "Asset",
-                        "Quantity Transacted",
-                        "Spot Price Currency",
-                        "Spot Price at Transaction",
-                        "Subtotal",
-                        "Total (inclusive of fees and/or spread)",
-                        "Fees and/or Spread",
-                        "Notes",
-                    ]
-                # Coinbase export format from mid 2021 and before
-                elif num_columns == 9:
-                    assert fields == [
-                        "Timestamp",
-                        "Transaction Type",
-                        "Asset",
-                        "Quantity Transacted",
-                        "EUR Spot Price at Transaction",
-                        "EUR Subtotal",
-                        "EUR Total (inclusive of fees)",
-                        "EUR Fees",
-                        "Notes",
-                    ]
-                else:
+                if num_columns not in COINBASE_FIELDS:
                     raise RuntimeError(
                         "Unknown Coinbase format: "
                         "Number of rows do not match known versions: "
                         f"{file_path}."
                     )
+                if num_columns == 11:
+                    assert version == 4
+                assert fields in COINBASE_FIELDS[num_columns]
             except AssertionError as e:
                 msg = (
                     "Unable to read coinbase file: Malformed header. "
@@ -442,18 +702,12 @@ class Book:
 
                 # Parse data.
                 if version == 4:
-                    utc_time = datetime.datetime.strptime(
-                        _utc_time, "%Y-%m-%d %H:%M:%S UTC"
-                    )
-                else:
-                    utc_time = datetime.datetime.strptime(
-                        _utc_time, "%Y-%m-%dT%H:%M:%SZ"
-                    )
-                utc_time = utc_time.replace(tzinfo=datetime.timezone.utc)
-                operation = operation_mapping.get(operation, operation)
-                change = misc.force_decimal(_change)
+                    _utc_time = _utc_time.removesuffix(" UTC")
+                utc_time = misc.parse_utc_timestamp(_utc_time)
+                operation = COINBASE_OPERATION_MAPPING.get(operation, operation)
+                change = misc.cached_force_decimal(_change)
                 # `eur_subtotal` and `eur_fee` are None for withdrawals.
-                eur_subtotal = misc.xdecimal(_eur_subtotal)
+                eur_subtotal = misc.cached_xdecimal(_eur_subtotal)
                 if version == 4:
                     change = abs(change)
                     eur_subtotal = abs(eur_subtotal) if eur_subtotal else None
@@ -461,9 +715,9 @@ class Book:
                     # Cost without fees from CSV is missing. This can happen for
                     # old transactions (<2018), event though something was bought.
                     # Calculate the `eur_subtotal` from `eur_spot`.
-                    if eur_spot := misc.xdecimal(_eur_spot):
+                    if eur_spot := misc.cached_xdecimal(_eur_spot):
                         eur_subtotal = eur_spot * change
-                eur_fee = misc.xdecimal(_eur_fee)
+                eur_fee = misc.cached_xdecimal(_eur_fee)
 
                 # Validate data.
                 assert operation
@@ -473,19 +727,13 @@ class Book:
 
                 # Calculated price
                 if eur_subtotal:
-                    assert isinstance(eur_subtotal, decimal.Decimal)
                     price_calc = eur_subtotal / change
-                    # Save price in our local database for later.
-                    set_price_db(platform, coin, "EUR", utc_time, price_calc)
+                    prices.append((coin, "EUR", utc_time, price_calc))
 
                 if operation == "Convert":
                     # Parse change + coin from remark, which is
                     # in format "Converted 0,123 ETH to 0,456 BTC".
-                    match = re.match(
-                        r"^Converted [0-9,\.]+ [A-Z]+ to "
-                        r"(?P<change>[0-9,\.]+) (?P<coin>[A-Z]+)$",
-                        remark,
-                    )
+                    match = COINBASE_CONVERT_PATTERN.fullmatch(remark)
                     assert match
 
                     _convert_change = match.group("change").replace(",", ".")
@@ -511,9 +759,7 @@ class Book:
                     )
 
                     # Save convert price in local database, too.
-                    set_price_db(
-                        platform, convert_coin, "EUR", utc_time, convert_eur_spot
-                    )
+                    prices.append((convert_coin, "EUR", utc_time, convert_eur_spot))
                 else:
                     # Add operation normally to the list.
                     self.append_operation(
@@ -549,11 +795,13 @@ class Book:
 
                 # Add paid fees to the list.
                 if eur_fee:
-                    assert isinstance(eur_fee, decimal.Decimal)
                     self.append_operation(
                         "Fee", utc_time, platform, eur_fee, "EUR", row, file_path
                     )
 
+        # Save prices in our local database for later.
+        set_prices_db(platform, prices)
+
     def _read_coinbase_v2(self, file_path: Path) -> None:
         self._read_coinbase(file_path=file_path, version=2)
 
@@ -565,49 +813,39 @@ class Book:
 
     def _read_coinbase_pro(self, file_path: Path) -> None:
         platform = "coinbase_pro"
-        operation_mapping = {
-            "BUY": "Buy",
-            "SELL": "Sell",
-        }
 
-        with open(file_path, encoding="utf8") as f:
+        with open(
+            file_path, encoding="utf8", newline="", buffering=READ_BUFFER_SIZE
+        ) as f:
             reader = csv.reader(f)
 
             # Skip header.
             next(reader)
 
             for (
-                portfolio,
-                trade_id,
-                product,
-                operation,
-                _utc_time,
-                _size,
-                size_unit,
-                _price,
-                _fee,
-                total,
-                price_fee_total_unit,
-            ) in reader:
-                row = reader.line_num
-
+                row,
+                (
+                    _portfolio,
+                    _trade_id,
+                    _product,
+                    operation,
+                    _utc_time,
+                    _size,
+                    size_unit,
+                    _price,
+                    _fee,
+                    _total,
+                    price_fee_total_unit,
+                ),
+            ) in enumerate(reader, start=2):
                 # Parse data.
-                utc_time = datetime.datetime.strptime(
-                    _utc_time, "%Y-%m-%dT%H:%M:%S.%fZ"
-                )
-                utc_time = utc_time.replace(tzinfo=datetime.timezone.utc)
-                operation = operation_mapping.get(operation, operation)
-                size = misc.force_decimal(_size)
-                price = misc.force_decimal(_price)
-                fee = misc.xdecimal(_fee)
+                utc_time = misc.parse_utc_timestamp(_utc_time)
+                operation = COINBASE_PRO_OPERATION_MAPPING.get(operation, operation)
+                size = misc.cached_force_decimal(_size)
+                price = misc.cached_force_decimal(_price)
+                fee = misc.cached_xdecimal(_fee)
                 total_price = size * price
 
-                # Unused variables.
-                del portfolio
-                del trade_id
-                del product
-                del total
-
                 # Validate data.
                 assert operation
                 assert size
@@ -661,51 +899,48 @@ class Book:
         fee_sign_of_file: Optional[bool] = None
 
         platform = "kraken"
-        operation_mapping = {
-            "spend": "Sell",  # Sell ordered via 'Buy Crypto' button
-            "receive": "Buy",  # Buy ordered via 'Buy Crypto' button
-            "reward": "StakingInterest",
-            "staking": "StakingInterest",
-            "deposit": "Deposit",
-            "withdrawal": "Withdrawal",
-        }
 
-        with open(file_path, encoding="utf8") as f:
+        # Resolve every Kraken asset name only once per file.
+        coins: dict[str, str] = {}
+
+        with open(
+            file_path, encoding="utf8", newline="", buffering=READ_BUFFER_SIZE
+        ) as f:
             reader = csv.reader(f)
 
             # Skip header.
             next(reader)
 
-            for columns in reader:
+            for row, columns in enumerate(reader, start=2):
 
                 num_columns = len(columns)
                 # Kraken ledgers export format from October 2020 and ongoing
                 if num_columns == 10:
                     (
-                        txid,
+                        _txid,
                         refid,
                         _utc_time,
                         _type,
                         subtype,
-                        aclass,
+                        _aclass,
                         _asset,
                         _amount,
                         _fee,
-                        balance,
+                        _balance,
                     ) = columns
 
                 # Kraken ledgers export format from September 2020 and before
                 elif num_columns == 9:
                     (
-                        txid,
+                        _txid,
                         refid,
                         _utc_time,
                         _type,
-                        aclass,
+                        _aclass,
                         _asset,
                         _amount,
                         _fee,
-                        balance,
+                        _balance,
                     ) = columns
                 else:
                     log.error(
@@ -714,20 +949,13 @@ class Book:
                     )
                     raise RuntimeError
 
-                row = reader.line_num
-
-                # Parse data.
-                utc_time = datetime.datetime.strptime(_utc_time, "%Y-%m-%d %H:%M:%S")
-                utc_time = utc_time.replace(tzinfo=datetime.timezone.utc)
-                change = misc.force_decimal(_amount)
-                # remove the appended .S for staked assets
-                _asset = _asset.removesuffix(".S")
-                coin = kraken_asset_map.get(_asset, _asset)
-                fee = misc.force_decimal(_fee)
+                # Check the fee sign of every row, including the skipped ones,
+                # so that all fees of the file are validated.
+                fee = misc.cached_force_decimal(_fee)
                 # An older implementation expected always positive fees
                 # It seems that newer ledger files can have negative fee
                 # values instead.
-                if fee != 0:
+                if fee:
                     # As soon as the first fee!=0 appears, check whether the
                     # fees are positive or negative. All fees in the file
                     # should have the same sign.
@@ -735,7 +963,7 @@ class Book:
                         fee_sign_of_file = fee < 0
                     # Adjust the fee sign so that fees are always positive.
                     if fee_sign_of_file is True:
-                        fee *= -1
+                        fee = -fee
                     if fee < 0:
                         log.error(
                             f"{file_path} row {row}: Unexpected fee sign. "
@@ -744,11 +972,14 @@ class Book:
                         )
                         raise RuntimeError
 
-                operation = operation_mapping.get(_type)
+                # Determine the operation before parsing the remaining row, so
+                # that skipped and unsupported rows are not parsed any further.
+                operation = KRAKEN_OPERATION_MAPPING.get(_type)
                 if operation is None:
                     if _type == "trade":
-                        operation = "Sell" if change < 0 else "Buy"
-                    elif _type in ["margin trade", "rollover", "settled", "margin"]:
+                        # Buy or sell, depending on the sign of the change.
+                        pass
+                    elif _type in KRAKEN_MARGIN_TYPES:
                         log.error(
                             f"{file_path} row {row}: Margin trading is currently not "
                             "supported. Please create an Issue or PR."
@@ -782,7 +1013,21 @@ class Book:
                             "currently not supported. Please create an Issue or PR."
                         )
                         raise RuntimeError
-                change = abs(change)
+
+                # Parse data.
+                utc_time = misc.parse_utc_timestamp(_utc_time)
+                change = misc.cached_force_decimal(_amount)
+                coin = coins.get(_asset)
+                if coin is None:
+                    # remove the appended .S for staked assets
+                    asset = _asset.removesuffix(".S")
+                    coin = coins[_asset] = kraken_asset_map.get(asset, asset)
+                if change.is_signed():
+                    if _type == "trade":
+                        operation = "Sell"
+                    change = -change
+                elif _type == "trade":
+                    operation = "Buy"
 
                 # Validate data.
                 assert operation
@@ -809,51 +1054,42 @@ class Book:
                         operation, utc_time, platform, change, coin, row, file_path
                     )
                     op_fee = None
-                    if fee != 0:
+                    if fee:
                         op_fee = self.create_operation(
                             "Fee", utc_time, platform, fee, coin, row, file_path
                         )
+                    # Look up the state of this refid once.
+                    held_ops = self.kraken_held_ops[refid]
+                    appended = held_ops["appended"]
                     # If this is the first occurrence, set the "appended" flag to false
                     # and don't append the operation to the list. Instead, store the
                     # data for verifying or appending it later.
-                    if self.kraken_held_ops[refid]["appended"] is None:
-                        self.kraken_held_ops[refid]["appended"] = False
-                        self.kraken_held_ops[refid]["operation"] = op
-                        self.kraken_held_ops[refid]["operation_fee"] = op_fee
+                    if appended is None:
+                        held_ops["appended"] = False
+                        held_ops["operation"] = op
+                        held_ops["operation_fee"] = op_fee
                     # If this is the second occurrence, append a new operation, set the
                     # "appended" flag to True and assert that the data of this operation
                     # agrees with the data of the first occurrence.
-                    elif self.kraken_held_ops[refid]["appended"] is False:
-                        self.kraken_held_ops[refid]["appended"] = True
+                    elif appended is False:
+                        held_ops["appended"] = True
+                        first_op = held_ops["operation"]
                         try:
                             # Make sure, that the found operations with the
                             # same refid  have the same operation type, amount
                             # of change and same coin.
                             assert isinstance(
-                                op, type(self.kraken_held_ops[refid]["operation"])
-                            ), (
-                                "operation "
-                                f"({op.type_name} != "
-                                f'{self.kraken_held_ops[refid]["operation"].type_name})'
-                            )
+                                op, type(first_op)
+                            ), f"operation ({op.type_name} != {first_op.type_name})"
                             assert (
-                                op.change
-                                == self.kraken_held_ops[refid]["operation"].change
-                            ), (
-                                "change "
-                                f"({op.change} != "
-                                f'{self.kraken_held_ops[refid]["operation"].change})'
-                            )
+                                op.change == first_op.change
+                            ), f"change ({op.change} != {first_op.change})"
                             assert (
-                                op.coin == self.kraken_held_ops[refid]["operation"].coin
-                            ), (
-                                "coin "
-                                f"({op.coin} != "
-                                f'{self.kraken_held_ops[refid]["operation"].coin})'
-                            )
+                                op.coin == first_op.coin
+                            ), f"coin ({op.coin} != {first_op.coin})"
                         except AssertionError as e:
                             # Row is internally saved as list[int].
-                            first_row = self.kraken_held_ops[refid]["operation"].line[0]
+                            first_row = first_op.line[0]
                             log.error(
                                 "Two internal kraken operations matched by the "
                                 f"same {refid=} don't have the same {e}.\n"
@@ -870,18 +1106,18 @@ class Book:
                         # withdrawal as soon as the second withdrawal occurs. Therefore,
                         # overwrite the operation with the stored first withdrawal.
                         if operation == "Withdrawal":
-                            op = self.kraken_held_ops[refid]["operation"]
-                            op_fee = self.kraken_held_ops[refid]["operation_fee"]
+                            op = first_op
+                            op_fee = held_ops["operation_fee"]
                         # Finally, append the operations and delete the stored
                         # operations to reduce memory consumption
                         self._append_operation(op)
                         if op_fee:
                             self._append_operation(op_fee)
-                        del self.kraken_held_ops[refid]["operation"]
-                        del self.kraken_held_ops[refid]["operation_fee"]
+                        del held_ops["operation"]
+                        del held_ops["operation_fee"]
                     # If an operation with the same refid has been already appended,
                     # this is the third occurrence. Throw an error if this happens.
-                    elif self.kraken_held_ops[refid]["appended"] is True:
+                    elif appended is True:
                         log.error(
                             f"{file_path} row {row}: More than two entries with refid "
                             f"{refid} should not exist ({operation}). "
@@ -892,7 +1128,7 @@ class Book:
                     else:
                         log.error(
                             f"{file_path} row {row}: Unknown value for appended "
-                            f"operation flag {self.kraken_held_ops[refid]['appended']}."
+                            f"operation flag {appended}."
                             "Please create an Issue or PR."
                         )
                         raise TypeError
@@ -902,7 +1138,7 @@ class Book:
                     self.append_operation(
                         operation, utc_time, platform, change, coin, row, file_path
                     )
-                    if fee != 0:
+                    if fee:
                         self.append_operation(
                             "Fee", utc_time, platform, fee, coin, row, file_path
                         )
@@ -926,7 +1162,10 @@ class Book:
         """
 
         platform = "bitpanda_pro"
-        with open(file_path, encoding="utf8") as f:
+        prices: list[tuple[str, str, datetime.datetime, decimal.Decimal]] = []
+        with open(
+            file_path, encoding="utf8", newline="", buffering=READ_BUFFER_SIZE
+        ) as f:
             reader = csv.reader(f)
 
             # skip header
@@ -957,38 +1196,13 @@ class Book:
                 )
                 return
 
-            line = next(reader)
-            assert line in [
-                [
-                    "Order ID",
-                    "Trade ID",
-                    "Type",
-                    "Market",
-                    "Amount",
-                    "Amount Currency",
-                    "Price",
-                    "Price Currency",
-                    "Fee",
-                    "Fee Currency",
-                    "Time (UTC)",
-                ],
-                [
-                    "Order ID",
-                    "Trade ID",
-                    "Type",
-                    "Market",
-                    "Amount",
-                    "Amount Currency",
-                    "Price",
-                    "Price Currency",
-                    "Fee",
-                    "Fee Currency",
-                    "Time (UTC)",
-                    "BEST_EUR Rate",
-                ],
-            ]
+            header = tuple(next(reader))
+            assert header in (
+                EXPECTED_HEADERS["bitpanda_pro_trades"],
+                EXPECTED_HEADERS["bitpanda_pro_trades"] + ("BEST_EUR Rate",),
+            )
 
-            for current_line in reader:
+            for row, current_line in enumerate(reader, start=reader.line_num + 1):
                 if len(current_line) == 11:
                     (
                         _order_id,
@@ -1022,8 +1236,6 @@ class Book:
                 else:
                     raise NotImplementedError
 
-                row = reader.line_num
-
                 # trade pair is of form e.g. BTC_EUR
                 assert [amount_currency, price_currency] == trade_pair.split("_")
 
@@ -1031,7 +1243,7 @@ class Book:
                 # there were only these two operations
                 assert operation in ["BUY", "SELL"], "Unsupported operation"
 
-                change = misc.force_decimal(amount)
+                change = misc.cached_force_decimal(amount)
                 assert change > 0, "Unexpected value for 'Amount' column"
 
                 # see _get_price_bitpanda_pro in price_data.py
@@ -1055,28 +1267,26 @@ class Book:
                     operation.title(), utc_time, platform, change, coin, row, file_path
                 )
 
-                # Save price in our local database for later.
-                price = misc.force_decimal(_price)
-                set_price_db(platform, coin, price_currency, utc_time, price)
+                price = misc.cached_force_decimal(_price)
+                prices.append((coin, price_currency, utc_time, price))
                 if best_price:
-                    set_price_db(
-                        platform,
-                        "BEST",
-                        "EUR",
-                        utc_time,
-                        misc.force_decimal(best_price),
+                    prices.append(
+                        ("BEST", "EUR", utc_time, misc.cached_force_decimal(best_price))
                     )
 
                 self.append_operation(
                     "Fee",
                     utc_time,
                     platform,
-                    misc.force_decimal(fee),
+                    misc.cached_force_decimal(fee),
                     fee_currency,
                     row,
                     file_path,
                 )
 
+        # Save prices in our local database for later.
+        set_prices_db(platform, prices)
+
     def _read_bitpanda(self, file_path: Path) -> None:
         """Reads a trade statement from Bitpanda.
 
@@ -1085,44 +1295,22 @@ class Book:
         """
 
         platform = "bitpanda"
+        prices: list[tuple[str, str, datetime.datetime, decimal.Decimal]] = []
 
-        operation_mapping = {
-            "deposit": "Deposit",
-            "withdrawal": "Withdrawal",
-            "buy": "Buy",
-            "sell": "Sell",
-        }
-
-        with open(file_path, encoding="utf8") as f:
+        with open(
+            file_path, encoding="utf8", newline="", buffering=READ_BUFFER_SIZE
+        ) as f:
             reader = csv.reader(f)
-            line = next(reader)
 
             # skip header, there are multiple lines
-            while line != [
-                "Transaction ID",
-                "Timestamp",
-                "Transaction Type",
-                "In/Out",
-                "Amount Fiat",
-                "Fiat",
-                "Amount Asset",
-                "Asset",
-                "Asset market price",
-                "Asset market price currency",
-                "Asset class",
-                "Product ID",
-                "Fee",
-                "Fee asset",
-                "Spread",
-                "Spread Currency",
-            ]:
-                try:
-                    line = next(reader)
-                except StopIteration:
-                    log.error(f"Expected header not found in file {file_path}")
-                    raise RuntimeError
+            for line in reader:
+                if tuple(line) == EXPECTED_HEADERS["bitpanda"]:
+                    break
+            else:
+                log.error(f"Expected header not found in file {file_path}")
+                raise RuntimeError
 
-            for (
+            for row, (
                 _tx_id,
                 csv_utc_time,
                 operation,
@@ -1139,15 +1327,9 @@ class Book:
                 fee_currency,
                 _spread,
                 _spread_currency,
-            ) in reader:
-                row = reader.line_num
-
-                # make RFC3339 timestamp ISO 8601 parseable
-                if csv_utc_time[-1] == "Z":
-                    csv_utc_time = csv_utc_time[:-1] + "+00:00"
-
+            ) in enumerate(reader, start=reader.line_num + 1):
                 # timezone information is already taken care of with this
-                utc_time = datetime.datetime.fromisoformat(csv_utc_time)
+                utc_time = misc.parse_iso_timestamp(csv_utc_time)
 
                 # transfer ops seem to be akin to airdrops. In my case I got a
                 # CocaCola transfer, which I don't want to track. Would need to
@@ -1161,7 +1343,7 @@ class Book:
 
                 # fail for unknown ops
                 try:
-                    operation = operation_mapping[operation]
+                    operation = BITPANDA_OPERATION_MAPPING[operation]
                 except KeyError:
                     log.error(
                         f"Unsupported operation '{operation}' "
@@ -1171,7 +1353,7 @@ class Book:
 
                 if operation in ["Deposit", "Withdrawal"]:
                     if asset_class == "Fiat":
-                        change = misc.force_decimal(amount_fiat)
+                        change = misc.cached_force_decimal(amount_fiat)
                         if fiat != asset:
                             log.error(
                                 f"Asset {asset} should be {fiat} in "
@@ -1179,7 +1361,7 @@ class Book:
                             )
                             raise RuntimeError
                     elif asset_class == "Cryptocurrency":
-                        change = misc.force_decimal(amount_asset)
+                        change = misc.cached_force_decimal(amount_asset)
                     else:
                         log.error(
                             f"Unknown asset class {asset_class}: Should be 'Fiat' or "
@@ -1194,14 +1376,13 @@ class Book:
                             "fiat currencies is not fully implemented yet."
                         )
                         raise RuntimeError
-                    change = misc.force_decimal(amount_asset)
-                    change_fiat = misc.force_decimal(amount_fiat)
-                    # Save price in our local database for later.
+                    change = misc.cached_force_decimal(amount_asset)
+                    change_fiat = misc.cached_force_decimal(amount_fiat)
                     # Rounded price in CSV
                     # price = misc.force_decimal(asset_price)
                     # Calculated price
                     price_calc = change_fiat / change
-                    set_price_db(platform, asset, config.FIAT, utc_time, price_calc)
+                    prices.append((asset, config.FIAT, utc_time, price_calc))
 
                 if change < 0:
                     log.error(
@@ -1241,16 +1422,21 @@ class Book:
                         "Fee",
                         utc_time,
                         platform,
-                        misc.force_decimal(fee),
+                        misc.cached_force_decimal(fee),
                         fee_currency,
                         row,
                         file_path,
                     )
 
+        # Save prices in our local database for later.
+        set_prices_db(platform, prices)
+
     def _read_custom_eur(self, file_path: Path) -> None:
         fiat = "EUR"
 
-        with open(file_path, encoding="utf8") as f:
+        with open(
+            file_path, encoding="utf8", newline="", buffering=READ_BUFFER_SIZE
+        ) as f:
             reader = csv.reader(f)
 
             # Skip header.
@@ -1281,20 +1467,15 @@ class Book:
 
                 # Parse data.
                 try:
-                    utc_time = datetime.datetime.strptime(
-                        _timestamp, "%m/%d/%Y %H:%M:%S"
-                    )
+                    utc_time = misc.strptime_utc(_timestamp, "%m/%d/%Y %H:%M:%S")
                 except ValueError:
-                    utc_time = datetime.datetime.strptime(
-                        _timestamp, "%m/%d/%Y %H:%M:%S.%f"
-                    )
-                utc_time = utc_time.replace(tzinfo=datetime.timezone.utc)
-                buy_quantity = misc.xdecimal(_buy_quantity)
-                buy_value_in_fiat = misc.xdecimal(_buy_value_in_fiat)
-                sell_quantity = misc.xdecimal(_sell_quantity)
-                sell_value_in_fiat = misc.xdecimal(_sell_value_in_fiat)
-                fee_quantity = misc.xdecimal(_fee_quantity)
-                fee_value_in_fiat = misc.xdecimal(_fee_value_in_fiat)
+                    utc_time = misc.strptime_utc(_timestamp, "%m/%d/%Y %H:%M:%S.%f")
+                buy_quantity = misc.cached_xdecimal(_buy_quantity)
+                buy_value_in_fiat = misc.cached_xdecimal(_buy_value_in_fiat)
+                sell_quantity = misc.cached_xdecimal(_sell_quantity)
+                sell_value_in_fiat = misc.cached_xdecimal(_sell_value_in_fiat)
+                fee_quantity = misc.cached_xdecimal(_fee_quantity)
+                fee_value_in_fiat = misc.cached_xdecimal(_fee_value_in_fiat)
 
                 # ... and define which operation to add.
                 add_operations: list[
@@ -1357,184 +1538,20 @@ class Book:
     def detect_exchange(self, file_path: Path) -> Optional[str]:
         if file_path.suffix == ".csv":
 
-            expected_header_row = {
-                "binance": 1,
-                "binance_v2": 1,
-                "coinbase": 1,
-                "coinbase_v2": 1,
-                "coinbase_v3": 1,
-                "coinbase_v4": 4,
-                "coinbase_pro": 1,
-                "kraken_ledgers_old": 1,
-                "kraken_ledgers": 1,
-                "kraken_trades": 1,
-                "bitpanda_pro_trades": 4,
-                "bitpanda": 7,
-                "custom_eur": 1,
-            }
-
-            expected_headers = {
-                "binance": [
-                    "UTC_Time",
-                    "Account",
-                    "Operation",
-                    "Coin",
-                    "Change",
-                    "Remark",
-                ],
-                "binance_v2": [
-                    "User_ID",
-                    "UTC_Time",
-                    "Account",
-                    "Operation",
-                    "Coin",
-                    "Change",
-                    "Remark",
-                ],
-                "coinbase": [
-                    "You can use this transaction report to inform your "
-                    "likely tax obligations. For US customers, Sells, "
-                    "Converts, and Rewards Income, and Coinbase Earn "
-                    "transactions are taxable events. For final tax "
-                    "obligations, please consult your tax advisor."
-                ],
-                "coinbase_v2": [
-                    "You can use this transaction report to inform your "
-                    "likely tax obligations. For US customers, Sells, "
-                    "Converts, Rewards Income, Coinbase Earn "
-                    "transactions, and Donations are taxable events. "
-                    "For final tax obligations, please consult your tax advisor."
-                ],
-                "coinbase_v3": [
-                    "You can use this transaction report to inform your "
-                    "likely tax obligations. For US customers, Sells, "
-                    "Converts, Rewards Income, Learning Rewards, "
-                    "and Donations are taxable events. "
-                    "For final tax obligations, please consult your tax advisor."
-                ],
-                "coinbase_v4": [
-                    "ID",
-                    "Timestamp",
-                    "Transaction Type",
-                    "Asset",
-                    "Quantity Transacted",
-                    "Price Currency",
-                    "Price at Transaction",
-                    "Subtotal",
-                    "Total (inclusive of fees and/or spread)",
-                    "Fees and/or Spread",
-                    "Notes",
-                ],
-                "coinbase_pro": [
-                    "portfolio",
-                    "trade id",
-                    "product",
-                    "side",
-                    "created at",
-                    "size",
-                    "size unit",
-                    "price",
-                    "fee",
-                    "total",
-                    "price/fee/total unit",
-                ],
-                "kraken_ledgers_old": [
-                    "txid",
-                    "refid",
-                    "time",
-                    "type",
-                    "aclass",
-                    "asset",
-                    "amount",
-                    "fee",
-                    "balance",
-                ],
-                "kraken_ledgers": [
-                    "txid",
-                    "refid",
-                    "time",
-                    "type",
-                    "subtype",
-                    "aclass",
-                    "asset",
-                    "amount",
-                    "fee",
-                    "balance",
-                ],
-                "kraken_trades": [
-                    "txid",
-                    "ordertxid",
-                    "pair",
-                    "time",
-                    "type",
-                    "ordertype",
-                    "price",
-                    "cost",
-                    "fee",
-                    "vol",
-                    "margin",
-                    "misc",
-                    "ledgers",
-                ],
-                "bitpanda_pro_trades": [
-                    "Order ID",
-                    "Trade ID",
-                    "Type",
-                    "Market",
-                    "Amount",
-                    "Amount Currency",
-                    "Price",
-                    "Price Currency",
-                    "Fee",
-                    "Fee Currency",
-                    "Time (UTC)",
-                ],
-                "bitpanda": [
-                    "Transaction ID",
-                    "Timestamp",
-                    "Transaction Type",
-                    "In/Out",
-                    "Amount Fiat",
-                    "Fiat",
-                    "Amount Asset",
-                    "Asset",
-                    "Asset market price",
-                    "Asset market price currency",
-                    "Asset class",
-                    "Product ID",
-                    "Fee",
-                    "Fee asset",
-                    "Spread",
-                    "Spread Currency",
-                ],
-                "custom_eur": [
-                    "Type",
-                    "Buy Quantity",
-                    "Buy Asset",
-                    "Buy Value in EUR",
-                    "Sell Quantity",
-                    "Sell Asset",
-                    "Sell Value in EUR",
-                    "Fee Quantity",
-                    "Fee Asset",
-                    "Fee Value in EUR",
-                    "Wallet",
-                    "Timestamp UTC",
-                    "Note",
-                ],
-            }
-            with open(file_path, encoding="utf8") as f:
-                reader = csv.reader(f)
-                # check all potential headers at their expected header row
-                for exchange, expected in expected_headers.items():
-                    header_row_num = expected_header_row[exchange]
-                    # iterate since header row may appear earlier
-                    for _ in range(header_row_num):
-                        header = next(reader, None)
-                        if header == expected:
-                            return exchange
-                    # rewind the file after each header check
-                    f.seek(0)
+            # Replace undecodable bytes, so that files with another encoding
+            # are skipped like any other unknown file.
+            with open(file_path, encoding="utf8", errors="replace", newline="") as f:
+                # Only look at the beginning of the file, even if the file
+                # is huge and has no line breaks.
+                reader = csv.reader(io.StringIO(f.read(DETECT_EXCHANGE_WINDOW)))
+                # Read the file once and check each row for a known header.
+                # The header row may appear earlier than expected.
+                for row_num, row in enumerate(
+                    itertools.islice(reader, MAX_HEADER_ROW), start=1
+                ):
+                    exchange = HEADER_EXCHANGES.get(tuple(row))
+                    if exchange and row_num <= EXPECTED_HEADER_ROW[exchange]:
+                        return exchange
 
         return None
 
@@ -1633,58 +1650,54 @@ class Book:
         these two operations might belong together and we can calculate
         the paid price for this transaction.
         """
-        # Group operations by platform.
-        for platform, platform_operations in misc.group_by(
-            self.operations, "platform"
+        # Group operations by platform and time.
+        # Look at all operations which happend at the same time.
+        for (platform, timestamp), time_operations in misc.group_by(
+            self.operations, "platform_utc_time"
         ).items():
-            # Group operations by time.
-            # Look at all operations which happend at the same time.
-            for timestamp, time_operations in misc.group_by(
-                platform_operations, "utc_time"
-            ).items():
-                buytr = selltr = None
-                buycount = sellcount = 0
-
-                # Extract the buy and sell operation.
-                for operation in time_operations:
-                    if isinstance(operation, tr.Buy):
-                        buytr = operation
-                        buycount += 1
-                    elif isinstance(operation, tr.Sell):
-                        selltr = operation
-                        sellcount += 1
-
-                # Skip the operations of this timestamp when there aren't
-                # exactly one buy and one sell operation.
-                # We can only match the buy and sell operations, when there
-                # are exactly one buy and one sell operation.
-                if not (buycount == 1 and sellcount == 1):
-                    continue
+            buytr = selltr = None
+            buycount = sellcount = 0
+
+            # Extract the buy and sell operation.
+            for operation in time_operations:
+                if isinstance(operation, tr.Buy):
+                    buytr = operation
+                    buycount += 1
+                elif isinstance(operation, tr.Sell):
+                    selltr = operation
+                    sellcount += 1
+
+            # Skip the operations of this timestamp when there aren't
+            # exactly one buy and one sell operation.
+            # We can only match the buy and sell operations, when there
+            # are exactly one buy and one sell operation.
+            if not (buycount == 1 and sellcount == 1):
+                continue
 
-                assert isinstance(timestamp, datetime.datetime)
-                assert isinstance(buytr, tr.Buy)
-                assert isinstance(selltr, tr.Sell)
+            assert isinstance(timestamp, datetime.datetime)
+            assert isinstance(buytr, tr.Buy)
+            assert isinstance(selltr, tr.Sell)
 
-                # Price definition example for buying BTC with EUR:
-                # Symbol: BTCEUR
-                # coin: BTC (buytr.coin)
-                # reference coin: EUR (selltr.coin)
-                # price = traded EUR / traded BTC
-                price = decimal.Decimal(selltr.change / buytr.change)
+            # Price definition example for buying BTC with EUR:
+            # Symbol: BTCEUR
+            # coin: BTC (buytr.coin)
+            # reference coin: EUR (selltr.coin)
+            # price = traded EUR / traded BTC
+            price = decimal.Decimal(selltr.change / buytr.change)
 
-                log.debug(
-                    f"Adding {buytr.coin}/{selltr.coin} price from CSV: "
-                    f"{price} for {platform} at {timestamp}"
-                )
+            log.debug(
+                f"Adding {buytr.coin}/{selltr.coin} price from CSV: "
+                f"{price} for {platform} at {timestamp}"
+            )
 
-                set_price_db(
-                    platform,
-                    buytr.coin,
-                    selltr.coin,
-                    timestamp,
-                    price,
-                    overwrite=True,
-                )
+            set_price_db(
+                platform,
+                buytr.coin,
+                selltr.coin,
+                timestamp,
+                price,
+                overwrite=True,
+            )
 
     def merge_identical_operations(self) -> None:
         grouped_ops = misc.group_by(self.operations, tr.Operation.identical_columns)
@@ -1704,126 +1717,134 @@ class Book:
         # Only keep none fee operations in book.
         self.operations = operations
 
+        # Group book operations by platform and time once, instead of
+        # searching the whole book for every group of fees.
+        # { (platform, utc_time): { index: operation } }
+        operations_by_time: defaultdict[
+            tuple[str, datetime.datetime], dict[int, tr.Operation]
+        ] = defaultdict(dict)
+        # Group the indices of these operations by type in the same pass.
+        # { (platform, utc_time): { operation typename: list of indices } }
+        type_index: defaultdict[
+            tuple[str, datetime.datetime], defaultdict[str, list[int]]
+        ] = defaultdict(lambda: defaultdict(list))
+        for idx, op in enumerate(self.operations):
+            operations_by_time[op.platform_utc_time][idx] = op
+            type_index[op.platform_utc_time][op.type_name].append(idx)
+
         # Match fees to book operations.
-        for platform, _fees in misc.group_by(all_fees, "platform").items():
-            for utc_time, fees in misc.group_by(_fees, "utc_time").items():
-
-                # Find matching operations by platform and time.
-                matching_operations = {
-                    idx: op
-                    for idx, op in enumerate(self.operations)
-                    if op.platform == platform and op.utc_time == utc_time
-                }
-
-                # Group matching operations in dict with
-                # { operation typename: list of indices }
-                t_op = collections.defaultdict(list)
-                for idx, op in matching_operations.items():
-                    t_op[op.type_name].append(idx)
-
-                # Check if this is a buy/sell-pair.
-                # Fees might occure by other operation types,
-                # but this is currently not implemented.
-                is_buy_sell_pair = all(
-                    (
-                        len(matching_operations) == 2,
-                        len(t_op[tr.Buy.type_name_c()]) == 1,
-                        len(t_op[tr.Sell.type_name_c()]) == 1,
-                    )
+        for platform_utc_time, fees in misc.group_by(
+            all_fees, "platform_utc_time"
+        ).items():
+
+            # Find matching operations by platform and time.
+            matching_operations = operations_by_time.get(platform_utc_time, {})
+            t_op = type_index[platform_utc_time]
+            type_counts = collections.Counter(
+                {type_name: len(idxs) for type_name, idxs in t_op.items()}
+            )
+
+            # Check if this is a buy/sell-pair.
+            # Fees might occure by other operation types,
+            # but this is currently not implemented.
+            if type_counts == BUY_SELL_PAIR:
+                # Fees have to be added to all buys and sells.
+                # 1. Fees on sells are the transaction cost,
+                #    which might be fully tax relevant for this sell
+                #    and which gets removed from the account balance
+                # 2. Fees on buys increase the buy-in price of the coins
+                #    which is relevant when selling these (not buying)
+                (sell_idx,) = t_op[tr.Sell.type_name_c()]
+                (buy_idx,) = t_op[tr.Buy.type_name_c()]
+                assert self.operations[sell_idx].fees is None
+                assert self.operations[buy_idx].fees is None
+                self.operations[sell_idx].fees = fees
+                self.operations[buy_idx].fees = fees
+            else:
+                log.warning(
+                    "Fee matching is not implemented for this case. "
+                    "Your fees will be discarded and are not evaluated in "
+                    "the tax evaluation.\n"
+                    "Please create an Issue or PR.\n\n"
+                    f"{matching_operations=}\n{fees=}"
                 )
-                if is_buy_sell_pair:
-                    # Fees have to be added to all buys and sells.
-                    # 1. Fees on sells are the transaction cost,
-                    #    which might be fully tax relevant for this sell
-                    #    and which gets removed from the account balance
-                    # 2. Fees on buys increase the buy-in price of the coins
-                    #    which is relevant when selling these (not buying)
-                    (sell_idx,) = t_op[tr.Sell.type_name_c()]
-                    (buy_idx,) = t_op[tr.Buy.type_name_c()]
-                    assert self.operations[sell_idx].fees is None
-                    assert self.operations[buy_idx].fees is None
-                    self.operations[sell_idx].fees = fees
-                    self.operations[buy_idx].fees = fees
-                else:
-                    log.warning(
-                        "Fee matching is not implemented for this case. "
-                        "Your fees will be discarded and are not evaluated in "
-                        "the tax evaluation.\n"
-                        "Please create an Issue or PR.\n\n"
-                        f"{matching_operations=}\n{fees=}"
-                    )
+
+    @staticmethod
+    def _link_trade_pair(buy_op: tr.Buy, sell_op: tr.Sell) -> None:
+        """Link a buy and a sell operation which belong to the same trade.
+
+        Args:
+            buy_op (tr.Buy)
+            sell_op (tr.Sell)
+        """
+        assert (
+            buy_op.link is None
+            and buy_op.buying_cost is None
+            and sell_op.link is None
+            and sell_op.selling_value is None
+        ), "Operations of a trade pair can only be linked once."
+        buy_op.link = sell_op
+        sell_op.link = buy_op
 
     def resolve_trades(self) -> None:
+        # Group operations which were traded at the same time by type with dict
+        # { (platform, utc_time): { operation typename: list of operations } }
+        grouped_operations: defaultdict[
+            tuple[str, datetime.datetime], defaultdict[str, list[tr.Operation]]
+        ] = defaultdict(lambda: defaultdict(list))
+        for op in self.operations:
+            grouped_operations[op.platform_utc_time][op.type_name].append(op)
+
         # Match trades which belong together (traded at same time).
-        for _, _operations in misc.group_by(self.operations, "platform").items():
-            for _, matching_operations in misc.group_by(
-                _operations, "utc_time"
-            ).items():
-                # Count matching operations by type with dict
-                # { operation typename: list of operations }
-                t_op = collections.defaultdict(list)
-                for op in matching_operations:
-                    t_op[op.type_name].append(op)
-
-                # Check if this is a buy/sell-pair.
-                # Fees might occure by other operation types,
-                # but this is currently not implemented.
-                is_buy_sell_pair = all(
-                    (
-                        len(matching_operations) == 2,
-                        len(t_op[tr.Buy.type_name_c()]) == 1,
-                        len(t_op[tr.Sell.type_name_c()]) == 1,
-                    )
-                )
-                if is_buy_sell_pair:
-                    # Add link that this is a trade pair.
-                    (buy_op,) = t_op[tr.Buy.type_name_c()]
-                    assert isinstance(buy_op, tr.Buy)
-                    (sell_op,) = t_op[tr.Sell.type_name_c()]
-                    assert isinstance(sell_op, tr.Sell)
-                    assert buy_op.link is None
-                    assert buy_op.buying_cost is None
-                    buy_op.link = sell_op
-                    assert sell_op.link is None
-                    assert sell_op.selling_value is None
-                    sell_op.link = buy_op
-                    continue
+        for (platform, _), t_op in grouped_operations.items():
+            type_counts = collections.Counter(
+                {type_name: len(ops) for type_name, ops in t_op.items()}
+            )
 
-                # Binance allows to convert small assets in one go to BNB.
-                # Our `merge_identical_column` function merges all BNB which
-                # gets bought at that time together.
-                # BUG Trade connection can not be established with our current
-                #     method.
-                # Calculate the buying cost of this type of operation by all
-                # small asset sells.
-                is_binance_bnb_small_asset_transfer = all(
-                    (
-                        all(op.platform == "binance" for op in matching_operations),
-                        len(t_op[tr.Buy.type_name_c()]) == 1,
-                        len(t_op[tr.Sell.type_name_c()]) >= 1,
-                        len(t_op.keys()) == 2,
-                    )
-                )
+            # Check if this is a buy/sell-pair.
+            # Fees might occure by other operation types,
+            # but this is currently not implemented.
+            if type_counts == BUY_SELL_PAIR:
+                # Add link that this is a trade pair.
+                (buy_op,) = t_op[tr.Buy.type_name_c()]
+                assert isinstance(buy_op, tr.Buy)
+                (sell_op,) = t_op[tr.Sell.type_name_c()]
+                assert isinstance(sell_op, tr.Sell)
+                self._link_trade_pair(buy_op, sell_op)
+                continue
 
-                if is_binance_bnb_small_asset_transfer:
-                    (buy_op,) = t_op[tr.Buy.type_name_c()]
-                    assert isinstance(buy_op, tr.Buy)
-                    sell_ops = t_op[tr.Sell.type_name_c()]
-                    assert all(isinstance(op, tr.Sell) for op in sell_ops)
-                    assert buy_op.link is None
-                    assert buy_op.buying_cost is None
-                    buying_costs = [self.price_data.get_cost(op) for op in sell_ops]
-                    buy_op.buying_cost = misc.dsum(buying_costs)
-                    assert len(sell_ops) == len(buying_costs)
-                    for sell_op, buying_cost in zip(sell_ops, buying_costs):
-                        assert isinstance(sell_op, tr.Sell)
-                        assert sell_op.link is None
-                        assert sell_op.selling_value is None
-                        percent = buying_cost / buy_op.buying_cost
-                        sell_op.selling_value = self.price_data.get_partial_cost(
-                            buy_op, percent
-                        )
-                    continue
+            # Binance allows to convert small assets in one go to BNB.
+            # Our `merge_identical_column` function merges all BNB which
+            # gets bought at that time together.
+            # BUG Trade connection can not be established with our current
+            #     method.
+            # Calculate the buying cost of this type of operation by all
+            # small asset sells.
+            is_binance_bnb_small_asset_transfer = (
+                platform == "binance"
+                and len(type_counts) == 2
+                and type_counts[tr.Buy.type_name_c()] == 1
+                and type_counts[tr.Sell.type_name_c()] >= 1
+            )
+
+            if is_binance_bnb_small_asset_transfer:
+                (buy_op,) = t_op[tr.Buy.type_name_c()]
+                assert isinstance(buy_op, tr.Buy)
+                sell_ops = t_op[tr.Sell.type_name_c()]
+                assert buy_op.link is None and buy_op.buying_cost is None
+                buying_costs = [self.price_data.get_cost(op) for op in sell_ops]
+                buy_op.buying_cost = sum(buying_costs, decimal.Decimal())
+                for sell_op, buying_cost in zip(sell_ops, buying_costs):
+                    assert (
+                        isinstance(sell_op, tr.Sell)
+                        and sell_op.link is None
+                        and sell_op.selling_value is None
+                    )
+                    percent = buying_cost / buy_op.buying_cost
+                    sell_op.selling_value = self.price_data.get_partial_cost(
+                        buy_op, percent
+                    )
+                continue
 
     def read_file(self, file_path: Path) -> None:
         """Import transactions form an account statement.
@@ -1838,9 +1859,8 @@ class Book:
 
         if exchange := self.detect_exchange(file_path):
 
-            try:
-                read_file = getattr(self, f"_read_{exchange}")
-            except AttributeError:
+            read_file = self.readers.get(exchange)
+            if read_file is None:
                 log.warning(
                     f"Unable to read files from the exchange `{exchange}`. "
                     f"Skipping `{file_path}`."
@@ -1849,36 +1869,43 @@ class Book:
 
             log.info("Reading file from exchange %s at %s", exchange, file_path)
             read_file(file_path)
-        elif file_path.suffix not in (
-            ".zip",
-            ".rar",
-        ):
+        else:
             log.warning(
                 f"Unable to detect the exchange of file `{file_path}`. "
                 "Skipping file."
             )
 
-    def get_account_statement_paths(self, statements_dir: Path) -> list[Path]:
-        """Return file paths of all account statements in `statements_dir`.
+    def get_account_statement_paths(self, statements_dir: Path) -> Iterator[Path]:
+        """Yield file paths of all account statements in `statements_dir`.
 
         Args:
             statements_dir (str): Folder in which account statements
                                   will be searched.
 
-        Returns:
-            list[Path]: List of account statement file paths.
+        Yields:
+            Path: Account statement file path.
         """
-        file_paths: list[Path] = []
-
         if statements_dir.is_dir():
-            for file_path in statements_dir.iterdir():
-                # Ignore .gitkeep and temporary excel files.
-                filename = file_path.stem
-                if filename == ".gitkeep" or filename.startswith("~$"):
-                    continue
-
-                file_paths.append(file_path)
-        return file_paths
+            # Filter by the name of the directory entries before creating
+            # the paths.
+            with os.scandir(statements_dir) as entries:
+                for entry in entries:
+                    # Ignore folders. The entry type is usually known from
+                    # the directory listing without an additional stat call.
+                    if not entry.is_file():
+                        continue
+
+                    # Ignore .gitkeep and temporary excel files.
+                    filename, suffix = os.path.splitext(entry.name)
+                    if filename == ".gitkeep" or filename.startswith("~$"):
+                        continue
+
+                    # Ignore archives, which might contain the account
+                    # statements but can not be read directly.
+                    if suffix in (".zip", ".rar"):
+                        continue
+
+                    yield Path(entry.path)
 
     def read_files(self) -> bool:
         """Read all account statements from the folder specified in the config.
@@ -1888,14 +1915,16 @@ class Book:
         """
         paths = self.get_account_statement_paths(config.ACCOUNT_STATMENTS_PATH)
 
-        if not paths:
+        # Start reading while the folder is still listed.
+        first_path = next(paths, None)
+        if first_path is None:
             log.warning(
                 "No account statement files located in %s.",
                 config.ACCOUNT_STATMENTS_PATH,
             )
             return False
 
-        for file_path in paths:
+        for file_path in itertools.chain((first_path,), paths):
             self.read_file(file_path)
 
         if not bool(self):
@@ -242,6 +242,38 @@ def __delete_price_db(
         conn.commit()
 
 
+def __insert_price_db(
+    cur: sqlite3.Cursor,
+    tablename: str,
+    utc_time: datetime.datetime,
+    price: decimal.Decimal,
+) -> None:
+    """Insert price into database without committing.
+
+    Create table if necessary.
+
+    Args:
+        cur (sqlite3.Cursor)
+        tablename (str)
+        utc_time (datetime.datetime)
+        price (decimal.Decimal)
+    """
+    query = f"INSERT INTO `{tablename}` ('utc_time', 'price') VALUES (?, ?);"
+    try:
+        cur.execute(query, (utc_time, str(price)))
+    except sqlite3.OperationalError as e:
+        if str(e) == f"no such table: {tablename}":
+            create_query = (
+                f"CREATE TABLE `{tablename}`"
+                "(utc_time DATETIME PRIMARY KEY, "
+                "price VARCHAR(255) NOT NULL);"
+            )
+            cur.execute(create_query)
+            cur.execute(query, (utc_time, str(price)))
+        else:
+            raise e
+
+
 def __set_price_db(
     db_path: Path,
     tablename: str,
@@ -265,20 +297,7 @@ def __set_price_db(
 
     with sqlite3.connect(db_path) as conn:
         cur = conn.cursor()
-        query = f"INSERT INTO `{tablename}` ('utc_time', 'price') VALUES (?, ?);"
-        try:
-            cur.execute(query, (utc_time, str(price)))
-        except sqlite3.OperationalError as e:
-            if str(e) == f"no such table: {tablename}":
-                create_query = (
-                    f"CREATE TABLE `{tablename}`"
-                    "(utc_time DATETIME PRIMARY KEY, "
-                    "price VARCHAR(255) NOT NULL);"
-                )
-                cur.execute(create_query)
-                cur.execute(query, (utc_time, str(price)))
-            else:
-                raise e
+        __insert_price_db(cur, tablename, utc_time, price)
         conn.commit()
         cur.close()
 
@@ -362,6 +381,63 @@ def set_price_db(
             raise e
 
 
+def set_prices_db(
+    platform: str,
+    prices: list[Tuple[str, str, datetime.datetime, decimal.Decimal]],
+    db_path: Optional[Path] = None,
+    overwrite: bool = False,
+) -> None:
+    """Write multiple prices to database.
+
+    All prices are inserted with one connection and committed at once.
+    Prices which exist already are passed to `set_price_db` afterwards,
+    which compares them with the database price.
+
+    Args:
+        platform (str)
+        prices (list[Tuple[str, str, datetime.datetime, decimal.Decimal]]):
+            Coin, reference coin, utc_time and price of each price.
+        db_path (Optional[Path]): Defaults to None.
+        overwrite (bool): Default to False.
+    """
+    if not prices:
+        return
+
+    db_path = get_db_path(platform, db_path)
+    existing_prices = []
+
+    if not db_path.exists():
+        from patch_database import create_new_database
+
+        create_new_database(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        cur = conn.cursor()
+        for coin, reference_coin, utc_time, price in prices:
+            assert coin != reference_coin
+
+            tablename, inverted = get_sorted_tablename(coin, reference_coin)
+            try:
+                __insert_price_db(
+                    cur,
+                    tablename,
+                    utc_time,
+                    misc.reciprocal(price) if inverted else price,
+                )
+            except sqlite3.IntegrityError as e:
+                if f"UNIQUE constraint failed: {tablename}.utc_time" in str(e):
+                    existing_prices.append((coin, reference_coin, utc_time, price))
+                else:
+                    raise e
+        conn.commit()
+        cur.close()
+
+    for coin, reference_coin, utc_time, price in existing_prices:
+        set_price_db(
+            platform, coin, reference_coin, utc_time, price, db_path, overwrite
+        )
+
+
 def _sort_pair(coin: str, reference_coin: str) -> Tuple[str, str, bool]:
     """Sort the coin pair in alphanumerical order.
 
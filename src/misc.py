@@ -17,6 +17,7 @@
 import collections
 import datetime
 import decimal
+import functools
 import random
 import re
 import subprocess
@@ -111,6 +112,11 @@ def force_decimal(x: Union[None, str, int, float, decimal.Decimal]) -> decimal.D
     Returns:
         decimal.Decimal
     """
+    if isinstance(x, str) and x:
+        # Fast path for non-empty strings, which are read from account
+        # statements. These can be passed to Decimal directly.
+        return decimal.Decimal(x)
+
     d = xdecimal(x)
     if isinstance(d, decimal.Decimal):
         return d
@@ -118,6 +124,39 @@ def force_decimal(x: Union[None, str, int, float, decimal.Decimal]) -> decimal.D
         raise ValueError(f"Could not parse `{d}` to decimal")
 
 
+@functools.lru_cache(maxsize=8192)
+def cached_force_decimal(x: str) -> decimal.Decimal:
+    """Convert a string to decimal like `force_decimal` and cache the result.
+
+    Account statements repeat the same values (e.g. fees) over and over
+    again. Decimals are immutable, so the parsed values can be shared.
+
+    Args:
+        x (str)
+
+    Raises:
+        ValueError: The given argument can not be parsed accordingly.
+
+    Returns:
+        decimal.Decimal
+    """
+    return force_decimal(x)
+
+
+def cached_xdecimal(x: str) -> Optional[decimal.Decimal]:
+    """Convert a string to decimal like `xdecimal` and cache the result.
+
+    Empty strings return None.
+
+    Args:
+        x (str)
+
+    Returns:
+        Optional[decimal.Decimal]
+    """
+    return cached_force_decimal(x) if x else None
+
+
 def reciprocal(d: decimal.Decimal) -> decimal.Decimal:
     return decimal.Decimal() if d == 0 else decimal.Decimal(1) / d
 
@@ -197,6 +236,71 @@ def parse_iso_timestamp(d: str) -> datetime.datetime:
     return datetime.datetime.fromisoformat(d)
 
 
+@functools.lru_cache(maxsize=8192)
+def strptime_utc(d: str, fmt: str) -> datetime.datetime:
+    """Parse a UTC timestamp with `fmt` and cache the result.
+
+    Account statements contain many entries with the same timestamp.
+
+    Args:
+        d (str): Timestamp in UTC.
+        fmt (str): Format code of `datetime.datetime.strptime`.
+
+    Returns:
+        datetime.datetime: Timezone aware datetime object.
+    """
+    utc_time = datetime.datetime.strptime(d, fmt)
+    return utc_time.replace(tzinfo=datetime.timezone.utc)
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_utc_timestamp(d: str) -> datetime.datetime:
+    """Parse a UTC timestamp of format `YYYY-MM-DD HH:MM:SS[.ffffff]`.
+
+    Date and time might also be separated by `T` and the timestamp might
+    end with `Z`. Parsing the fixed positions by hand is a lot faster than
+    `datetime.datetime.strptime`.
+
+    Args:
+        d (str): Timestamp in UTC.
+
+    Raises:
+        ValueError: The given timestamp does not match the format.
+
+    Returns:
+        datetime.datetime: Timezone aware datetime object.
+    """
+    if d[-1:] == "Z":
+        d = d[:-1]
+    if (
+        len(d) < 19
+        or d[4] != "-"
+        or d[7] != "-"
+        or d[10] not in " T"
+        or d[13] != ":"
+        or d[16] != ":"
+    ):
+        raise ValueError(f"Could not parse timestamp `{d}`")
+
+    microsecond = 0
+    if len(d) > 19:
+        fraction = d[20:]
+        if d[19] != "." or not 0 < len(fraction) <= 6:
+            raise ValueError(f"Could not parse timestamp `{d}`")
+        microsecond = int(fraction.ljust(6, "0"))
+
+    return datetime.datetime(
+        int(d[0:4]),
+        int(d[5:7]),
+        int(d[8:10]),
+        int(d[11:13]),
+        int(d[14:16]),
+        int(d[17:19]),
+        microsecond,
+        tzinfo=datetime.timezone.utc,
+    )
+
+
 def parse_iso_timestamp_to_decimal_timestamp(d: str) -> decimal.Decimal:
     return to_decimal_timestamp(datetime.datetime.fromisoformat(d))
 
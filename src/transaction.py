@@ -19,11 +19,12 @@ from __future__ import annotations
 import dataclasses
 import datetime
 import decimal
+import functools
 import itertools
 import typing
 from copy import copy
 from pathlib import Path
-from typing import ClassVar, Iterator, Optional
+from typing import Any, ClassVar, Iterator, Optional
 
 import config
 import log_config
@@ -73,20 +74,32 @@ class Operation:
         if self.change < 0:
             raise ValueError("Operation.change must be positive.")
 
-    def validate_types(self) -> bool:
-        ret = True
-        for field in dataclasses.fields(self):
+        # Operations are grouped by platform and time on several occasions.
+        # Build the composite key once instead of on every grouping.
+        self.platform_utc_time = (self.platform, self.utc_time)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def expected_field_types(cls) -> tuple[tuple[dataclasses.Field[Any], Any], ...]:
+        """Resolve the expected types of the fields of this operation class.
+
+        The type annotations are strings, which have to be evaluated. Do this
+        once per class instead of for every created operation.
+
+        Returns:
+            tuple[tuple[dataclasses.Field[Any], Any], ...]: Fields with the
+                expected type or tuple of types. The type is None for the
+                `fees` field, which is checked separately.
+        """
+        field_types = []
+        for field in dataclasses.fields(cls):
             if isinstance(field.type, typing._SpecialForm):
                 # No check for typing.Any, typing.Union, typing.ClassVar
                 # (without parameters)
                 continue
 
-            actual_value = getattr(self, field.name)
-
             if field.name == "fees":
-                # TODO currently kind of ignored, would be nice when
-                #      implemented correctly.
-                assert actual_value is None
+                field_types.append((field, None))
                 continue
 
             actual_type = typing.get_origin(field.type) or field.type
@@ -102,7 +115,21 @@ class Operation:
                     else:
                         actual_type = eval(actual_type)
 
-            if not isinstance(actual_value, actual_type):
+            field_types.append((field, actual_type))
+        return tuple(field_types)
+
+    def validate_types(self) -> bool:
+        ret = True
+        for field, expected_type in self.expected_field_types():
+            actual_value = getattr(self, field.name)
+
+            if field.name == "fees":
+                # TODO currently kind of ignored, would be nice when
+                #      implemented correctly.
+                assert actual_value is None
+                continue
+
+            if not isinstance(actual_value, expected_type):
                 log.warning(
                     f"\t{field.name}: '{type(actual_value)}' "
                     f"instead of '{field.type}'"
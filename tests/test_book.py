@@ -0,0 +1,56 @@
+# CoinTaxman
+# Copyright (C) 2021  Carsten Docktor <https://github.com/provinzio>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import book  # noqa: E402
+from price_data import PriceData  # noqa: E402
+
+
+class TestDetectExchange(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_path = Path(tmp_dir.name)
+        self.book = book.Book(PriceData())
+
+    def test_binance(self) -> None:
+        file_path = self.tmp_path / "binance.csv"
+        file_path.write_text(
+            "UTC_Time,Account,Operation,Coin,Change,Remark\n"
+            "2021-01-01 10:00:00,Spot,Buy,BTC,0.5,\n",
+            encoding="utf8",
+        )
+        self.assertEqual(self.book.detect_exchange(file_path), "binance")
+
+    def test_non_utf8_file_is_skipped(self) -> None:
+        # The first invalid byte lies behind the first few KB of the file.
+        file_path = self.tmp_path / "bank.csv"
+        file_path.write_bytes(
+            b"Datum,Buchungstext,Betrag\n"
+            + b"01.01.2021,Ueberweisung,1\n" * 1000
+            + "01.01.2021,Gebühr,1\n".encode("latin-1")
+        )
+        self.assertIsNone(self.book.detect_exchange(file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()